@@ -1,12 +1,60 @@
-import pandas as pd
+import asyncio
+import csv
+import numpy as np
+import httpx
 import requests
+import urllib3
 import json
-from datetime import datetime, date, timedelta
-import time
-from typing import Dict, List, Tuple, Optional
+import html
+import re
 import logging
 import os
+import sys
 import unicodedata
+from datetime import datetime, date, timedelta, timezone
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple, Optional
+
+from rapidfuzz import fuzz, process
+
+# Numba est optionnel: sans lui (ou pour une petite carte de matchs) le
+# calcul retombe sur le chemin NumPy vectorisé
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# pyarrow est optionnel: sans lui, seul le chemin CSV est utilisé
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# orjson (parseur C) est optionnel: repli sur le json de la stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ciso8601 (parseur de dates C) est optionnel: repli sur fromisoformat
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+
+def loads_response(response) -> object:
+    """Décode le corps JSON d'une réponse HTTP (orjson si disponible)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
 
 # Configuration depuis les variables d'environnement
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'VOTRE_BOT_TOKEN')
@@ -18,262 +66,499 @@ TENNIS_API_KEY = os.getenv('TENNIS_API_KEY', 'VOTRE_TENNIS_API_KEY')
 ATP_ELO_FILE = "atp_elo.csv"
 WTA_ELO_FILE = "wta_elo.csv"
 
+# Caches Parquet (typés, colonnaires): écrits au premier chargement CSV,
+# puis préférés au CSV pour les démarrages suivants
+ATP_ELO_PARQUET = "atp_elo.parquet"
+WTA_ELO_PARQUET = "wta_elo.parquet"
+
+# Mots-clés de surface, compilés en une seule alternative regex chacun:
+# un unique scan C du nom de tournoi remplace ~30 recherches de sous-chaînes
+CLAY_KEYWORDS = (
+    'roland', 'garros', 'french', 'rome', 'madrid', 'monte carlo', 'barcelona',
+    'clay', 'terre', 'battue', 'hamburg', 'bastad', 'gstaad', 'umag',
+    'bucharest', 'marrakech', 'estoril', 'munich', 'houston'
+)
+GRASS_KEYWORDS = (
+    'wimbledon', 'queens', 'halle', 'eastbourne', 'grass', 'gazon',
+    'hertogenbosch', 'mallorca', 'bad homburg', 'newport'
+)
+_CLAY_RE = re.compile('|'.join(map(re.escape, CLAY_KEYWORDS)))
+_GRASS_RE = re.compile('|'.join(map(re.escape, GRASS_KEYWORDS)))
+
+# Surfaces et codes de tour internés: chaque dict de match référence le
+# même objet str, et les comparaisons/hachages profitent du test d'identité
+SURF_HARD = sys.intern('hard')
+SURF_CLAY = sys.intern('clay')
+SURF_GRASS = sys.intern('grass')
+TOUR_ATP = sys.intern('ATP')
+TOUR_WTA = sys.intern('WTA')
+TOUR_UNKNOWN = sys.intern('Unknown')
+
+# Colonnes des tableaux ELO (structure of arrays)
+SURFACE_COLUMNS = {SURF_HARD: 0, SURF_CLAY: 1, SURF_GRASS: 2}
+
+# ELO attribué aux joueurs inconnus
+DEFAULT_ELO = 1500.0
+
+# Clés tennis de l'Odds API, épinglées: elles sont stables d'un run à
+# l'autre, ce qui évite l'aller-retour /v4/sports à chaque exécution. La
+# liste complète n'est re-téléchargée que si aucune clé épinglée ne
+# répond plus (voir get_matches_from_odds_api)
+TENNIS_SPORT_KEYS = (
+    'tennis_atp_aus_open_singles',
+    'tennis_atp_french_open',
+    'tennis_atp_wimbledon',
+    'tennis_atp_us_open',
+    'tennis_wta_aus_open_singles',
+    'tennis_wta_french_open',
+    'tennis_wta_wimbledon',
+    'tennis_wta_us_open',
+)
+
+# Seuils d'écart ELO -> icône du message (bisect_left: seuils stricts)
+_DIFF_THRESHOLDS = (50, 100, 200)
+_DIFF_ICONS = ("⚖️", "📈", "⚡", "🔥")  # petit, moyen, gros, très gros écart
+
+# Taille de carte à partir de laquelle le noyau JIT vaut son coût de
+# compilation (cache=True le réduit d'un run à l'autre, mais pas à zéro)
+JIT_MIN_MATCHES = 50
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Session HTTP partagée pour les appels synchrones résiduels (envoi du message
+# d'erreur de dernier recours): keep-alive + retries avec backoff exponentiel
+SESSION = requests.Session()
+SESSION.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=urllib3.util.Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+))
+
+
+def remove_accents(text: str) -> str:
+    """Supprime les accents d'un texte"""
+    if not text:
+        return ""
+    # Normaliser en NFD (décomposition) puis filtrer les marques diacritiques
+    return ''.join(c for c in unicodedata.normalize('NFD', text)
+                   if unicodedata.category(c) != 'Mn')
+
+
+@lru_cache(maxsize=4096)
+def normalize_player_name(name: str) -> str:
+    """Normalise le nom du joueur pour la recherche (mémoïsé par nom)"""
+    if not name:
+        return ""
+    # Normaliser complètement : minuscules, sans accents, sans caractères spéciaux
+    name = name.lower().strip()
+    # Supprimer les accents
+    name = remove_accents(name)
+    # Supprimer les caractères spéciaux mais garder les espaces
+    name = name.replace(".", "").replace(",", "").replace("'", "").replace("-", " ")
+    # Supprimer les espaces multiples
+    name = " ".join(name.split())
+    return name
+
+
+@lru_cache(maxsize=4096)
+def lnrm(name: str) -> str:
+    """Forme canonique LNRM d'un nom: décomposition NFKD, minuscules,
+    seuls les caractères alphanumériques sont conservés (les marques
+    diacritiques décomposées sont éliminées par le filtre isalnum)"""
+    if not name:
+        return ""
+    return ''.join(c for c in unicodedata.normalize('NFKD', name.lower())
+                   if c.isalnum())
+
+
+@lru_cache(maxsize=2048)
+def parse_iso_datetime(date_string: str) -> Optional[datetime]:
+    """Parse un horodatage ISO 8601, None si illisible (mémoïsé: les mêmes
+    chaînes reviennent d'une API à l'autre et d'un match à l'autre)"""
+    if ciso8601 is not None:
+        # Parseur C, gère le 'Z' final nativement
+        try:
+            return ciso8601.parse_datetime(date_string)
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=512)
+def get_surface_from_tournament(tournament_name: str) -> str:
+    """Détermine la surface selon le nom du tournoi (mémoïsé par tournoi)"""
+    if not tournament_name:
+        return SURF_HARD
+
+    tournament_lower = tournament_name.lower()
+
+    if _CLAY_RE.search(tournament_lower):
+        return SURF_CLAY
+    elif _GRASS_RE.search(tournament_lower):
+        return SURF_GRASS
+    else:
+        return SURF_HARD  # Surface par défaut (dur)
+
+
+class MatchAnalysis(NamedTuple):
+    """Analyse d'un match: joueurs, ELO sur la surface et écart.
+
+    NamedTuple plutôt que dict: allocation plus compacte et accès attribut
+    à offset fixe pour les quelque 9 champs répétés sur chaque match.
+    """
+    player1: str
+    player1_elo: float
+    player2: str
+    player2_elo: float
+    surface: str
+    elo_difference: float
+    tour: str
+    tournament: str
+    commence_time: str
+
+
+if HAS_NUMBA:
+    @njit(cache=True, parallel=True)
+    def _compute_diffs_jit(atp_elo, wta_elo, p1_idx, p2_idx, surf_idx, is_atp):
+        """Noyau compilé: gather des ELO + différence absolue + ordre de tri"""
+        n = p1_idx.size
+        elo1 = np.empty(n, dtype=np.float32)
+        elo2 = np.empty(n, dtype=np.float32)
+
+        for k in prange(n):
+            elo_array = atp_elo if is_atp[k] else wta_elo
+            elo1[k] = elo_array[p1_idx[k], surf_idx[k]] if p1_idx[k] >= 0 else DEFAULT_ELO
+            elo2[k] = elo_array[p2_idx[k], surf_idx[k]] if p2_idx[k] >= 0 else DEFAULT_ELO
+
+        diffs = np.abs(elo1 - elo2)
+        return elo1, elo2, diffs, np.argsort(-diffs)
+
+
 class TennisEloBot:
     def __init__(self):
-        self.atp_elo = {}
-        self.wta_elo = {}
+        # Index nom normalisé -> ligne dans le tableau ELO (structure of arrays)
+        self.atp_index: Dict[str, int] = {}
+        self.wta_index: Dict[str, int] = {}
+        # Tableaux ELO contigus float32, une colonne par surface (voir SURFACE_COLUMNS)
+        self.atp_elo = np.empty((0, 3), dtype=np.float32)
+        self.wta_elo = np.empty((0, 3), dtype=np.float32)
+        # Index de recherche secondaires: forme LNRM -> ligne, nom de famille
+        # -> noms, et index inversé token -> noms pour la recherche floue
+        self.atp_lnrm: Dict[str, int] = {}
+        self.wta_lnrm: Dict[str, int] = {}
+        self.atp_lastname: Dict[str, List[str]] = {}
+        self.wta_lastname: Dict[str, List[str]] = {}
+        self.atp_tokens: Dict[str, List[str]] = {}
+        self.wta_tokens: Dict[str, List[str]] = {}
+        # Cache des résolutions de joueurs, clé (tour, nom brut de l'API):
+        # le même joueur revient entre les deux APIs et entre les matchs
+        self._elo_cache: Dict[Tuple[str, str], int] = {}
+        # Bornes temporelles du run, calculées une seule fois (voir _refresh_time_bounds)
+        self._refresh_time_bounds()
         self.load_elo_data()
+
+    def _refresh_time_bounds(self):
+        """Fige 'maintenant', 'aujourd'hui' et la fenêtre de 24h pour le run.
+
+        Évite de rappeler date.today()/datetime.now() pour chaque match;
+        rappelée au début de chaque analyse quotidienne.
+        """
+        self._now_utc = datetime.now(timezone.utc)
+        self._cutoff_utc = self._now_utc + timedelta(hours=24)
+        self._today = date.today()
+        self._today_iso = self._today.isoformat()
     
+    def _load_elo_csv(self, file_path: str, parquet_path: str) -> Tuple[Dict[str, int], 'np.ndarray']:
+        """Charge un tableau ELO (Parquet si présent, sinon CSV).
+
+        Retourne un index nom -> ligne et un tableau float32 (N, 3) dont les
+        colonnes suivent SURFACE_COLUMNS. Au premier chargement CSV, les
+        données nettoyées sont écrites en Parquet pour les runs suivants.
+        """
+        empty = np.empty((0, 3), dtype=np.float32)
+        names: List[str] = []
+
+        try:
+            if HAS_PYARROW and self._parquet_cache_is_fresh(file_path, parquet_path):
+                # Chemin rapide: colonnes typées, pas de tokenisation CSV
+                logger.info(f"Chargement du fichier {parquet_path}...")
+                table = pq.read_table(parquet_path, columns=['Player', 'hElo', 'cElo', 'gElo'])
+                names = table.column('Player').to_pylist()
+                elo_array = np.column_stack([
+                    table.column(col).to_numpy() for col in ('hElo', 'cElo', 'gElo')
+                ]).astype(np.float32)
+                logger.info(f"Fichier Parquet chargé: {len(names)} lignes")
+            else:
+                logger.info(f"Chargement du fichier {file_path}...")
+                # csv.DictReader en flux: pas de DataFrame, pas de colonnes inutiles
+                rows: List[Tuple[float, float, float, float]] = []
+                with open(file_path, newline='', encoding='utf-8') as f:
+                    for row in csv.DictReader(f):
+                        player = (row.get('Player') or '').lower().strip()
+                        # Ignorer les lignes vides et les en-têtes dupliqués
+                        if not player or player == 'player':
+                            continue
+                        # L'ELO global ne sert que de valeur par défaut par surface
+                        overall = self._safe_float(row.get('Elo'), DEFAULT_ELO)
+                        names.append(player)
+                        rows.append((
+                            self._safe_float(row.get('hElo'), overall),
+                            self._safe_float(row.get('cElo'), overall),
+                            self._safe_float(row.get('gElo'), overall)
+                        ))
+                elo_array = np.array(rows, dtype=np.float32) if rows else empty
+                logger.info(f"Fichier CSV chargé: {len(names)} lignes")
+
+                # Écrire le cache Parquet (données nettoyées) pour le prochain
+                # démarrage, estampillé avec le mtime du CSV source
+                if HAS_PYARROW:
+                    try:
+                        table = pa.table({
+                            'Player': names,
+                            'hElo': elo_array[:, 0],
+                            'cElo': elo_array[:, 1],
+                            'gElo': elo_array[:, 2]
+                        }).replace_schema_metadata({
+                            b'csv_mtime': repr(os.path.getmtime(file_path)).encode()
+                        })
+                        pq.write_table(table, parquet_path)
+                        logger.info(f"Cache Parquet écrit: {parquet_path}")
+                    except Exception as e:
+                        # Disque en lecture seule par exemple: on restera sur le CSV
+                        logger.debug("Cache Parquet non écrit pour %s: %s", file_path, e)
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement de {file_path}: {e}")
+            return {}, empty
+
+        # Index nom -> ligne, construit en un seul passage
+        index = {player: i for i, player in enumerate(names)}
+
+        # Ajouter les versions sans accents pour la recherche
+        for player_name in list(index):
+            player_name_normalized = self.remove_accents(player_name)
+            if player_name_normalized != player_name and player_name_normalized not in index:
+                index[player_name_normalized] = index[player_name]
+
+        return index, elo_array
+
+    @staticmethod
+    def _parquet_cache_is_fresh(file_path: str, parquet_path: str) -> bool:
+        """Vérifie que le cache Parquet correspond au CSV source: le mtime du
+        CSV est estampillé dans les métadonnées du schéma à l'écriture, et
+        seul le pied de fichier est lu ici (pas les données)"""
+        if not os.path.exists(parquet_path):
+            return False
+        try:
+            metadata = pq.read_schema(parquet_path).metadata or {}
+            cached_mtime = metadata.get(b'csv_mtime')
+            return cached_mtime == repr(os.path.getmtime(file_path)).encode()
+        except Exception as e:
+            logger.debug("Cache Parquet %s illisible: %s", parquet_path, e)
+            return False
+
+    @staticmethod
+    def _safe_float(value, default: float) -> float:
+        """Convertit une cellule CSV en float, valeur par défaut sinon (NaN inclus)"""
+        try:
+            parsed = float(value)
+        except (TypeError, ValueError):
+            return default
+        return parsed if parsed == parsed else default
+
+    @staticmethod
+    def _build_search_indexes(player_index: Dict[str, int]) -> Tuple[Dict[str, int], Dict[str, List[str]], Dict[str, List[str]]]:
+        """Construit les index de recherche: LNRM, nom de famille, et index
+        inversé token -> noms (les listes de candidats restent courtes, leur
+        intersection remplace le scan de tout le dictionnaire)"""
+        lnrm_index = {}
+        lastname_index = defaultdict(list)
+        token_index = defaultdict(list)
+
+        for name, idx in player_index.items():
+            lnrm_index.setdefault(lnrm(name), idx)
+            parts = name.split()
+            if parts:
+                lastname_index[parts[-1]].append(name)
+            for part in parts:
+                if len(part) > 1:
+                    token_index[part].append(name)
+
+        return lnrm_index, dict(lastname_index), dict(token_index)
+
     def load_elo_data(self):
         """Charge les données ELO depuis les fichiers CSV"""
         try:
-            # Chargement ATP ELO
-            logger.info(f"Chargement du fichier {ATP_ELO_FILE}...")
-            try:
-                # Lire le CSV en ignorant les colonnes vides
-                atp_df = pd.read_csv(ATP_ELO_FILE, encoding='utf-8')
-                # Supprimer les colonnes sans nom (Unnamed)
-                atp_df = atp_df.loc[:, ~atp_df.columns.str.contains('^Unnamed')]
-            except Exception as e:
-                logger.error(f"Erreur lors du chargement ATP: {e}")
-                atp_df = pd.DataFrame()
-                
-            logger.info(f"Fichier ATP chargé: {len(atp_df)} lignes")
-            logger.info(f"Colonnes ATP trouvées: {list(atp_df.columns)}")
-            
-            # Filtrer les lignes qui contiennent les en-têtes dupliqués
-            if 'Player' in atp_df.columns:
-                atp_df = atp_df[atp_df['Player'] != 'Player']
-            
-            for _, row in atp_df.iterrows():
-                if pd.notna(row.get('Player')):
-                    player_name = str(row['Player']).lower().strip()
-                    # Stocker aussi la version sans accents pour la recherche
-                    player_name_normalized = self.remove_accents(player_name)
-                    
-                    try:
-                        # Récupération des ELO par surface avec valeurs par défaut
-                        overall_elo = float(row.get('Elo', 1500)) if pd.notna(row.get('Elo')) else 1500.0
-                        hard_elo = float(row.get('hElo', overall_elo)) if pd.notna(row.get('hElo')) else overall_elo
-                        clay_elo = float(row.get('cElo', overall_elo)) if pd.notna(row.get('cElo')) else overall_elo
-                        grass_elo = float(row.get('gElo', overall_elo)) if pd.notna(row.get('gElo')) else overall_elo
-                        
-                        elo_data = {
-                            'overall': overall_elo,
-                            'hard': hard_elo,
-                            'clay': clay_elo,
-                            'grass': grass_elo
-                        }
-                        
-                        # Stocker avec le nom original et la version normalisée
-                        self.atp_elo[player_name] = elo_data
-                        if player_name != player_name_normalized:
-                            self.atp_elo[player_name_normalized] = elo_data
-                            
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Erreur conversion pour {player_name}: {e}")
-                        continue
-            
-            # Chargement WTA ELO
-            logger.info(f"Chargement du fichier {WTA_ELO_FILE}...")
-            try:
-                # Lire le CSV en ignorant les colonnes vides
-                wta_df = pd.read_csv(WTA_ELO_FILE, encoding='utf-8')
-                # Supprimer les colonnes sans nom (Unnamed)
-                wta_df = wta_df.loc[:, ~wta_df.columns.str.contains('^Unnamed')]
-            except Exception as e:
-                logger.error(f"Erreur lors du chargement WTA: {e}")
-                wta_df = pd.DataFrame()
-                
-            logger.info(f"Fichier WTA chargé: {len(wta_df)} lignes")
-            logger.info(f"Colonnes WTA trouvées: {list(wta_df.columns)}")
-            
-            # Filtrer les lignes qui contiennent les en-têtes dupliqués
-            if 'Player' in wta_df.columns:
-                wta_df = wta_df[wta_df['Player'] != 'Player']
-            
-            for _, row in wta_df.iterrows():
-                if pd.notna(row.get('Player')):
-                    player_name = str(row['Player']).lower().strip()
-                    # Stocker aussi la version sans accents pour la recherche
-                    player_name_normalized = self.remove_accents(player_name)
-                    
-                    try:
-                        # Récupération des ELO par surface avec valeurs par défaut
-                        overall_elo = float(row.get('Elo', 1500)) if pd.notna(row.get('Elo')) else 1500.0
-                        hard_elo = float(row.get('hElo', overall_elo)) if pd.notna(row.get('hElo')) else overall_elo
-                        clay_elo = float(row.get('cElo', overall_elo)) if pd.notna(row.get('cElo')) else overall_elo
-                        grass_elo = float(row.get('gElo', overall_elo)) if pd.notna(row.get('gElo')) else overall_elo
-                        
-                        elo_data = {
-                            'overall': overall_elo,
-                            'hard': hard_elo,
-                            'clay': clay_elo,
-                            'grass': grass_elo
-                        }
-                        
-                        # Stocker avec le nom original et la version normalisée
-                        self.wta_elo[player_name] = elo_data
-                        if player_name != player_name_normalized:
-                            self.wta_elo[player_name_normalized] = elo_data
-                            
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"Erreur conversion pour {player_name}: {e}")
-                        continue
-            
-            logger.info(f"Chargé {len(self.atp_elo)} joueurs ATP et {len(self.wta_elo)} joueuses WTA")
-            
+            self.atp_index, self.atp_elo = self._load_elo_csv(ATP_ELO_FILE, ATP_ELO_PARQUET)
+            self.wta_index, self.wta_elo = self._load_elo_csv(WTA_ELO_FILE, WTA_ELO_PARQUET)
+
+            # Index de recherche pour éviter les scans linéaires dans find_player_elo
+            self.atp_lnrm, self.atp_lastname, self.atp_tokens = self._build_search_indexes(self.atp_index)
+            self.wta_lnrm, self.wta_lastname, self.wta_tokens = self._build_search_indexes(self.wta_index)
+
+            # Les résolutions mémoïsées ne valent que pour les données chargées
+            self._elo_cache.clear()
+
+            logger.info(f"Chargé {len(self.atp_index)} joueurs ATP et {len(self.wta_index)} joueuses WTA")
+
             # Debug: afficher quelques exemples
-            if self.atp_elo:
-                first_atp = list(self.atp_elo.items())[0]
-                logger.info(f"Exemple ATP: {first_atp[0]} -> {first_atp[1]}")
-            
-            if self.wta_elo:
-                first_wta = list(self.wta_elo.items())[0]
-                logger.info(f"Exemple WTA: {first_wta[0]} -> {first_wta[1]}")
-            
+            if self.atp_index:
+                first_atp = next(iter(self.atp_index))
+                logger.info(f"Exemple ATP: {first_atp} -> {self.atp_elo[self.atp_index[first_atp]]}")
+
+            if self.wta_index:
+                first_wta = next(iter(self.wta_index))
+                logger.info(f"Exemple WTA: {first_wta} -> {self.wta_elo[self.wta_index[first_wta]]}")
+
         except Exception as e:
             logger.error(f"Erreur lors du chargement des données ELO: {e}")
             import traceback
             logger.error(f"Traceback complet: {traceback.format_exc()}")
     
-    def remove_accents(self, text: str) -> str:
-        """Supprime les accents d'un texte"""
-        if not text:
-            return ""
-        # Normaliser en NFD (décomposition) puis filtrer les marques diacritiques
-        return ''.join(c for c in unicodedata.normalize('NFD', text) 
-                       if unicodedata.category(c) != 'Mn')
-    
-    def normalize_player_name(self, name: str) -> str:
-        """Normalise le nom du joueur pour la recherche"""
-        if not name:
-            return ""
-        # Normaliser complètement : minuscules, sans accents, sans caractères spéciaux
-        name = name.lower().strip()
-        # Supprimer les accents
-        name = self.remove_accents(name)
-        # Supprimer les caractères spéciaux mais garder les espaces
-        name = name.replace(".", "").replace(",", "").replace("'", "").replace("-", " ")
-        # Supprimer les espaces multiples
-        name = " ".join(name.split())
-        return name
-    
-    def find_player_elo(self, player_name: str, tour: str) -> Dict:
-        """Trouve l'ELO d'un joueur avec recherche flexible"""
+    # Fonctions de normalisation mémoïsées au niveau module (voir plus haut)
+    remove_accents = staticmethod(remove_accents)
+    normalize_player_name = staticmethod(normalize_player_name)
+    get_surface_from_tournament = staticmethod(get_surface_from_tournament)
+
+
+    def find_player_elo(self, player_name: str, tour: str) -> int:
+        """Trouve la ligne ELO d'un joueur (-1 si non trouvé), avec cache par run"""
         if not player_name:
-            return {'hard': 1500.0, 'clay': 1500.0, 'grass': 1500.0, 'overall': 1500.0}
-            
+            return -1
+
+        cache_key = (tour.upper(), player_name)
+        idx = self._elo_cache.get(cache_key)
+        if idx is None:
+            idx = self._find_player_elo_impl(player_name, tour)
+            self._elo_cache[cache_key] = idx
+        return idx
+
+    def _find_player_elo_impl(self, player_name: str, tour: str) -> int:
+        """Recherche flexible d'un joueur: directe, LNRM, nom de famille, floue"""
         normalized_name = self.normalize_player_name(player_name)
-        elo_data = self.atp_elo if tour.upper() == 'ATP' else self.wta_elo
-        
+        is_atp = tour.upper() == TOUR_ATP
+        player_index = self.atp_index if is_atp else self.wta_index
+        lnrm_index = self.atp_lnrm if is_atp else self.wta_lnrm
+        lastname_index = self.atp_lastname if is_atp else self.wta_lastname
+        token_index = self.atp_tokens if is_atp else self.wta_tokens
+
         # 1. Recherche directe
-        if normalized_name in elo_data:
-            logger.debug(f"Trouvé {player_name} par recherche directe")
-            return elo_data[normalized_name]
-        
-        # 2. Recherche approximative (nom contenu)
-        for stored_name, elo in elo_data.items():
-            if normalized_name in stored_name or stored_name in normalized_name:
-                logger.debug(f"Trouvé {player_name} -> {stored_name} par recherche approximative")
-                return elo
-        
-        # 3. Recherche par mots (nom et prénom)
+        if normalized_name in player_index:
+            logger.debug("Trouvé %s par recherche directe", player_name)
+            return player_index[normalized_name]
+
+        # 2. Recherche par forme canonique LNRM (sans accents ni séparateurs)
+        lnrm_name = lnrm(player_name)
+        if lnrm_name in lnrm_index:
+            logger.debug("Trouvé %s par forme LNRM", player_name)
+            return lnrm_index[lnrm_name]
+
+        # 3. Index inversé: intersection des listes de candidats par token.
+        # Les listes sont courtes (homonymes), l'intersection donne
+        # typiquement 1 à 3 candidats sans scanner tout le dictionnaire.
         name_parts = [part for part in normalized_name.split() if len(part) > 1]
-        if len(name_parts) >= 2:
-            for stored_name, elo in elo_data.items():
-                if all(part in stored_name for part in name_parts):
-                    logger.debug(f"Trouvé {player_name} -> {stored_name} par recherche par mots")
-                    return elo
-        
-        # 4. Recherche partielle sur le nom de famille (dernier mot)
-        if name_parts:
-            last_name = name_parts[-1]
-            if len(last_name) > 3:  # Éviter les correspondances trop courtes
-                for stored_name, elo in elo_data.items():
-                    if last_name in stored_name or any(last_name in part for part in stored_name.split()):
-                        logger.debug(f"Trouvé {player_name} -> {stored_name} par nom de famille")
-                        return elo
-        
-        # ELO par défaut si joueur non trouvé
+        fuzzy_choices = player_index.keys()
+
+        candidates = None
+        for part in name_parts:
+            posting = token_index.get(part, ())
+            candidates = set(posting) if candidates is None else candidates.intersection(posting)
+            if not candidates:
+                break
+
+        if candidates:
+            candidate_rows = {player_index[c] for c in candidates}
+            if len(candidate_rows) == 1:
+                logger.debug("Trouvé %s -> %s par index de tokens", player_name, next(iter(candidates)))
+                return candidate_rows.pop()
+            # Plusieurs candidats: restreindre la recherche floue à ceux-ci
+            fuzzy_choices = candidates
+        elif name_parts:
+            # 3bis. Repli sur le nom de famille seul (dernier mot)
+            lastname_candidates = lastname_index.get(name_parts[-1])
+            if lastname_candidates:
+                candidate_rows = {player_index[c] for c in lastname_candidates}
+                if len(candidate_rows) == 1:
+                    logger.debug("Trouvé %s -> %s par nom de famille", player_name, lastname_candidates[0])
+                    return candidate_rows.pop()
+                # Plusieurs homonymes: restreindre la recherche floue à ces candidats
+                fuzzy_choices = lastname_candidates
+
+        # 4. Recherche floue (rapidfuzz, implémentation C++)
+        hit = process.extractOne(normalized_name, fuzzy_choices,
+                                 scorer=fuzz.WRatio, score_cutoff=85)
+        if hit is not None:
+            logger.debug("Trouvé %s -> %s par recherche floue (score %.0f)", player_name, hit[0], hit[1])
+            return player_index[hit[0]]
+
+        # Joueur non trouvé: l'appelant utilisera l'ELO par défaut
         logger.warning(f"Joueur non trouvé: {player_name} ({tour}) - utilisation ELO par défaut")
-        return {'hard': 1500.0, 'clay': 1500.0, 'grass': 1500.0, 'overall': 1500.0}
-    
-    def get_surface_from_tournament(self, tournament_name: str) -> str:
-        """Détermine la surface selon le nom du tournoi"""
-        if not tournament_name:
-            return 'hard'
-            
-        tournament_lower = tournament_name.lower()
-        
-        # Tournois sur terre battue
-        clay_keywords = [
-            'roland', 'garros', 'french', 'rome', 'madrid', 'monte carlo', 'barcelona',
-            'clay', 'terre', 'battue', 'hamburg', 'bastad', 'gstaad', 'umag',
-            'bucharest', 'marrakech', 'estoril', 'munich', 'houston'
-        ]
-        
-        # Tournois sur gazon
-        grass_keywords = [
-            'wimbledon', 'queens', 'halle', 'eastbourne', 'grass', 'gazon',
-            'hertogenbosch', 'mallorca', 'bad homburg', 'newport'
-        ]
-        
-        if any(keyword in tournament_lower for keyword in clay_keywords):
-            return 'clay'
-        elif any(keyword in tournament_lower for keyword in grass_keywords):
-            return 'grass'
-        else:
-            return 'hard'  # Surface par défaut (dur)
+        return -1
+
+    def get_elo(self, tour: str, idx: int, surface: str) -> float:
+        """Lit l'ELO d'une ligne du tableau pour une surface donnée"""
+        if idx < 0:
+            return DEFAULT_ELO
+        elo_array = self.atp_elo if tour.upper() == TOUR_ATP else self.wta_elo
+        return float(elo_array[idx, SURFACE_COLUMNS.get(surface, SURFACE_COLUMNS[SURF_HARD])])
     
-    def get_matches_from_odds_api(self) -> List[Dict]:
-        """Récupère les matchs depuis l'API Odds - Version corrigée"""
+    async def get_matches_from_odds_api(self, client: 'httpx.AsyncClient') -> List[Dict]:
+        """Récupère les matchs depuis l'API Odds - requêtes concurrentes"""
         matches = []
-        
+
         if ODDS_API_KEY == 'VOTRE_ODDS_API_KEY':
             logger.warning("Clé API Odds non configurée")
             return matches
-        
+
         try:
-            # Utiliser l'endpoint 'upcoming' pour les sports de tennis disponibles
             base_url = "https://api.the-odds-api.com/v4/sports"
-            
-            # D'abord, récupérer la liste des sports disponibles
-            sports_url = f"{base_url}?apiKey={ODDS_API_KEY}"
-            logger.info("Récupération des sports disponibles...")
-            
-            sports_response = requests.get(sports_url, timeout=10)
-            
-            if sports_response.status_code == 200:
-                sports_data = sports_response.json()
-                tennis_sports = [sport for sport in sports_data if 'tennis' in sport.get('key', '').lower()]
-                
-                logger.info(f"Sports de tennis trouvés: {[sport['key'] for sport in tennis_sports]}")
-                
-                # Pour chaque sport de tennis, récupérer les matchs
-                for sport in tennis_sports:
-                    sport_key = sport['key']
-                    odds_url = f"{base_url}/{sport_key}/odds/?apiKey={ODDS_API_KEY}&regions=us&markets=h2h&dateFormat=iso"
-                    
+
+            # Récupérer les matchs des sports de tennis en parallèle, avec un
+            # sémaphore pour borner la concurrence
+            semaphore = asyncio.Semaphore(8)
+
+            async def fetch_odds(sport_key: str):
+                odds_url = f"{base_url}/{sport_key}/odds/?apiKey={ODDS_API_KEY}&regions=us&markets=h2h&dateFormat=iso"
+                async with semaphore:
                     logger.info(f"Récupération des matchs pour {sport_key}...")
-                    
-                    odds_response = requests.get(odds_url, timeout=10)
-                    
+                    return await client.get(odds_url, timeout=10)
+
+            async def fetch_all(sports: List[Dict]) -> bool:
+                """Interroge une liste de sports, accumule dans matches.
+                Retourne True si au moins une clé a répondu 200."""
+                responses = await asyncio.gather(
+                    *(fetch_odds(sport['key']) for sport in sports),
+                    return_exceptions=True
+                )
+                any_ok = False
+
+                for sport, odds_response in zip(sports, responses):
+                    sport_key = sport['key']
+
+                    if isinstance(odds_response, Exception):
+                        logger.warning(f"Erreur pour {sport_key}: {odds_response}")
+                        continue
+
                     if odds_response.status_code == 200:
-                        odds_data = odds_response.json()
+                        any_ok = True
+                        odds_data = loads_response(odds_response)
                         logger.info(f"Reçu {len(odds_data)} matchs pour {sport_key}")
-                        
+
                         for match in odds_data:
                             # Vérifier si le match est aujourd'hui ou dans les prochaines 24h
                             commence_time = match.get('commence_time', '')
                             if self.is_within_next_24h(commence_time):
                                 # Déterminer si c'est ATP ou WTA
-                                tour = 'ATP' if 'atp' in sport_key.lower() else 'WTA' if 'wta' in sport_key.lower() else 'Unknown'
-                                
+                                tour = TOUR_ATP if 'atp' in sport_key.lower() else TOUR_WTA if 'wta' in sport_key.lower() else TOUR_UNKNOWN
+
                                 matches.append({
                                     'player1': match.get('home_team', ''),
                                     'player2': match.get('away_team', ''),
@@ -281,43 +566,67 @@ class TennisEloBot:
                                     'tournament': sport.get('title', 'Unknown'),
                                     'commence_time': commence_time
                                 })
+                    elif odds_response.status_code in (404, 422):
+                        # Clé hors saison ou retirée: attendu pour les clés épinglées
+                        logger.debug("Clé %s indisponible (%s)", sport_key, odds_response.status_code)
                     else:
                         logger.warning(f"Erreur pour {sport_key}: {odds_response.status_code}")
-            else:
-                logger.error(f"Erreur récupération sports: {sports_response.status_code}")
-                
+
+                return any_ok
+
+            # Clés épinglées: pas d'aller-retour /v4/sports en temps normal.
+            # Le titre du tournoi est dérivé de la clé elle-même
+            pinned = [
+                {'key': key,
+                 'title': key[len('tennis_'):].replace('_', ' ').upper()}
+                for key in TENNIS_SPORT_KEYS
+            ]
+            if not await fetch_all(pinned):
+                # Aucune clé épinglée ne répond: re-découvrir la liste des
+                # sports (rotation de tournois) et réessayer avec celle-ci
+                logger.info("Clés épinglées indisponibles, récupération des sports...")
+                sports_response = await client.get(f"{base_url}?apiKey={ODDS_API_KEY}", timeout=10)
+
+                if sports_response.status_code == 200:
+                    sports_data = loads_response(sports_response)
+                    tennis_sports = [sport for sport in sports_data if 'tennis' in sport.get('key', '').lower()]
+                    logger.info(f"Sports de tennis trouvés: {[sport['key'] for sport in tennis_sports]}")
+                    await fetch_all(tennis_sports)
+                else:
+                    logger.error(f"Erreur récupération sports: {sports_response.status_code}")
+
         except Exception as e:
             logger.error(f"Erreur lors de la récupération depuis Odds API: {e}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
-        
+
         logger.info(f"Total matchs Odds API: {len(matches)}")
         return matches
-    
-    def get_matches_from_tennis_api(self) -> List[Dict]:
+
+    async def get_matches_from_tennis_api(self, client: 'httpx.AsyncClient') -> List[Dict]:
         """Récupère les matchs depuis Tennis API"""
         matches = []
-        
+
         if TENNIS_API_KEY == 'VOTRE_TENNIS_API_KEY':
             logger.warning("Clé Tennis API non configurée")
             return matches
-        
+
         try:
-            today_str = date.today().strftime('%Y-%m-%d')
+            today_str = self._today_iso
             url = f"https://api.api-tennis.com/tennis/?met=Matchs&APIkey={TENNIS_API_KEY}&date={today_str}"
-            
+
             logger.info(f"Récupération des matchs depuis Tennis API pour {today_str}...")
-            response = requests.get(url, timeout=10)
-            
+            response = await client.get(url, timeout=10)
+
             if response.status_code == 200:
-                data = response.json()
+                data = loads_response(response)
                 if 'result' in data and data['result']:
                     logger.info(f"Reçu {len(data['result'])} matchs de Tennis API")
                     
                     for match in data['result']:
                         # Déterminer le tour (ATP/WTA) basé sur le nom de la ligue
                         league_name = match.get('league_name', '').upper()
-                        tour = 'ATP' if 'ATP' in league_name or 'MEN' in league_name else 'WTA'
+                        tour = TOUR_ATP if 'ATP' in league_name or 'MEN' in league_name else TOUR_WTA
                         
                         matches.append({
                             'player1': match.get('match_hometeam_name', ''),
@@ -343,141 +652,185 @@ class TennisEloBot:
         """Vérifie si la date est dans les prochaines 24 heures"""
         if not date_string:
             return False
-            
-        try:
-            # Parser la date ISO
-            if date_string.endswith('Z'):
-                match_datetime = datetime.fromisoformat(date_string.replace('Z', '+00:00'))
-            else:
-                match_datetime = datetime.fromisoformat(date_string)
-            
-            # Obtenir l'heure actuelle
-            now = datetime.now(match_datetime.tzinfo)
-            
-            # Vérifier si c'est dans les prochaines 24h
-            time_diff = match_datetime - now
-            return timedelta(hours=0) <= time_diff <= timedelta(hours=24)
-            
-        except Exception as e:
-            logger.debug(f"Impossible de parser la date '{date_string}': {e}")
+
+        match_datetime = parse_iso_datetime(date_string)
+        if match_datetime is None:
+            logger.debug("Impossible de parser la date '%s'", date_string)
             return False
-    
+
+        # Les horodatages sans fuseau sont supposés UTC
+        if match_datetime.tzinfo is None:
+            match_datetime = match_datetime.replace(tzinfo=timezone.utc)
+
+        # Comparaison aux bornes figées au début du run
+        return self._now_utc <= match_datetime <= self._cutoff_utc
+
     def is_today(self, date_string: str) -> bool:
         """Vérifie si la date correspond à aujourd'hui"""
         if not date_string:
             return False
-            
+
+        # Chemin rapide: les horodatages ISO commencent par la date du jour
+        if date_string.startswith(self._today_iso):
+            return True
+
+        match_datetime = parse_iso_datetime(date_string)
+        if match_datetime is not None:
+            return match_datetime.date() == self._today
+
+        # Fallback pour les formats non ISO
         try:
-            # Différents formats de date possibles
-            formats = [
-                '%Y-%m-%dT%H:%M:%SZ',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d',
-                '%Y-%m-%dT%H:%M:%S'
-            ]
-            
-            for fmt in formats:
-                try:
-                    if 'T' in date_string and date_string.endswith('Z'):
-                        match_date = datetime.strptime(date_string, '%Y-%m-%dT%H:%M:%SZ').date()
-                    else:
-                        match_date = datetime.strptime(date_string, fmt).date()
-                    
-                    return match_date == date.today()
-                except ValueError:
-                    continue
-            
-            # Fallback: essayer de parser avec fromisoformat
-            match_date = datetime.fromisoformat(date_string.replace('Z', '+00:00')).date()
-            return match_date == date.today()
-            
-        except Exception as e:
-            logger.debug(f"Impossible de parser la date '{date_string}': {e}")
+            return datetime.strptime(date_string, '%Y-%m-%d %H:%M:%S').date() == self._today
+        except ValueError:
+            logger.debug("Impossible de parser la date '%s'", date_string)
             return False
     
-    def calculate_elo_differences(self, matches: List[Dict]) -> List[Dict]:
-        """Calcule les différences d'ELO pour chaque match"""
-        match_analyses = []
-        
+    def calculate_elo_differences(self, matches: List[Dict]) -> List[MatchAnalysis]:
+        """Calcule les différences d'ELO pour chaque match (calcul vectorisé)"""
+        # Résolution des joueurs: un passage Python pour construire les index
+        valid_matches = []
+        p1_idx, p2_idx, surf_idx, is_atp = [], [], [], []
+
         for match in matches:
             try:
                 if not match.get('player1') or not match.get('player2'):
                     logger.warning(f"Match avec joueurs manquants: {match}")
                     continue
-                
+
                 surface = self.get_surface_from_tournament(match.get('tournament', ''))
-                
-                player1_elo_data = self.find_player_elo(match['player1'], match.get('tour', 'ATP'))
-                player2_elo_data = self.find_player_elo(match['player2'], match.get('tour', 'ATP'))
-                
-                player1_elo = player1_elo_data.get(surface, player1_elo_data.get('overall', 1500))
-                player2_elo = player2_elo_data.get(surface, player2_elo_data.get('overall', 1500))
-                
-                elo_diff = abs(player1_elo - player2_elo)
-                
-                match_analyses.append({
-                    'player1': match['player1'],
-                    'player1_elo': player1_elo,
-                    'player2': match['player2'],
-                    'player2_elo': player2_elo,
-                    'surface': surface,
-                    'elo_difference': elo_diff,
-                    'tour': match.get('tour', 'Unknown'),
-                    'tournament': match.get('tournament', 'Unknown'),
-                    'commence_time': match.get('commence_time', '')
-                })
-                
+                tour = match.get('tour', TOUR_ATP)
+
+                p1_idx.append(self.find_player_elo(match['player1'], tour))
+                p2_idx.append(self.find_player_elo(match['player2'], tour))
+                surf_idx.append(SURFACE_COLUMNS.get(surface, SURFACE_COLUMNS[SURF_HARD]))
+                is_atp.append(tour.upper() == TOUR_ATP)
+                valid_matches.append((match, surface))
+
             except Exception as e:
                 logger.error(f"Erreur calcul ELO pour {match}: {e}")
                 import traceback
                 logger.error(f"Traceback: {traceback.format_exc()}")
-        
-        # Tri par différence d'ELO décroissante
-        sorted_matches = sorted(match_analyses, key=lambda x: x['elo_difference'], reverse=True)
-        logger.info(f"Analysé {len(sorted_matches)} matchs avec succès")
-        
-        return sorted_matches
+
+        if not valid_matches:
+            logger.info("Analysé 0 matchs avec succès")
+            return []
+
+        # Calcul vectorisé: gather des ELO puis différence absolue en un coup
+        p1_idx = np.asarray(p1_idx, dtype=np.intp)
+        p2_idx = np.asarray(p2_idx, dtype=np.intp)
+        surf_idx = np.asarray(surf_idx, dtype=np.intp)
+        atp_mask = np.asarray(is_atp, dtype=bool)
+
+        n = len(valid_matches)
+
+        if HAS_NUMBA and n >= JIT_MIN_MATCHES:
+            # Grande carte: noyau compilé (gather + diff + argsort en une passe)
+            elo1, elo2, diffs, order = _compute_diffs_jit(
+                self.atp_elo, self.wta_elo, p1_idx, p2_idx, surf_idx, atp_mask)
+        else:
+            elo1 = np.full(n, DEFAULT_ELO, dtype=np.float32)
+            elo2 = np.full(n, DEFAULT_ELO, dtype=np.float32)
+
+            for tour_mask, elo_array in ((atp_mask, self.atp_elo), (~atp_mask, self.wta_elo)):
+                mask1 = tour_mask & (p1_idx >= 0)
+                mask2 = tour_mask & (p2_idx >= 0)
+                elo1[mask1] = elo_array[p1_idx[mask1], surf_idx[mask1]]
+                elo2[mask2] = elo_array[p2_idx[mask2], surf_idx[mask2]]
+
+            diffs = np.abs(elo1 - elo2)
+
+            # Tri par différence d'ELO décroissante
+            order = np.argsort(-diffs)
+
+        match_analyses = []
+        for k in order:
+            match, surface = valid_matches[k]
+            match_analyses.append(MatchAnalysis(
+                player1=match['player1'],
+                player1_elo=float(elo1[k]),
+                player2=match['player2'],
+                player2_elo=float(elo2[k]),
+                surface=surface,
+                elo_difference=float(diffs[k]),
+                tour=match.get('tour', TOUR_UNKNOWN),
+                tournament=match.get('tournament', 'Unknown'),
+                commence_time=match.get('commence_time', '')
+            ))
+
+        logger.info(f"Analysé {len(match_analyses)} matchs avec succès")
+
+        return match_analyses
     
-    def format_telegram_message(self, matches: List[Dict]) -> str:
+    def format_telegram_message(self, matches: List[MatchAnalysis]) -> str:
         """Formate le message pour Telegram"""
         if not matches:
-            return f"🎾 Aucun match trouvé pour aujourd'hui ({date.today().strftime('%d/%m/%Y')})"
-        
-        message = f"🎾 **MATCHS TENNIS DU {date.today().strftime('%d/%m/%Y')}**\n"
-        message += f"📊 Classés par écart d'ELO (du plus grand au plus petit)\n\n"
+            return f"🎾 Aucun match trouvé pour aujourd'hui ({self._today.strftime('%d/%m/%Y')})"
         
+        # Construire la liste des fragments puis join: O(N) au lieu de O(N²)
+        # en copies de chaînes avec +=
+        parts = [
+            f"🎾 <b>MATCHS TENNIS DU {self._today.strftime('%d/%m/%Y')}</b>\n"
+            f"📊 Classés par écart d'ELO (du plus grand au plus petit)\n\n"
+        ]
+
+
         for i, match in enumerate(matches[:20], 1):  # Limiter à 20 matchs pour éviter les messages trop longs
-            higher_elo_player = match['player1'] if match['player1_elo'] > match['player2_elo'] else match['player2']
-            lower_elo_player = match['player2'] if match['player1_elo'] > match['player2_elo'] else match['player1']
-            higher_elo = max(match['player1_elo'], match['player2_elo'])
-            lower_elo = min(match['player1_elo'], match['player2_elo'])
-            
-            # Icône selon l'écart
-            if match['elo_difference'] > 200:
-                icon = "🔥"  # Très gros écart
-            elif match['elo_difference'] > 100:
-                icon = "⚡"  # Gros écart
-            elif match['elo_difference'] > 50:
-                icon = "📈"  # Écart moyen
-            else:
-                icon = "⚖️"  # Petit écart
-            
-            message += f"{icon} **Match {i}** ({match['tour']})\n"
-            message += f"🏆 {higher_elo_player} ({higher_elo:.0f})\n"
-            message += f"🆚 {lower_elo_player} ({lower_elo:.0f})\n"
-            message += f"🎯 Surface: {match['surface'].title()}\n"
-            message += f"📈 Écart ELO: **{match['elo_difference']:.0f}**\n"
-            message += f"🏟️ {match['tournament']}\n\n"
-        
+            # Une seule comparaison pour départager favori et outsider
+            (higher_elo_player, higher_elo), (lower_elo_player, lower_elo) = sorted(
+                ((match.player1, match.player1_elo), (match.player2, match.player2_elo)),
+                key=lambda pair: -pair[1]
+            )
+
+            # Icône selon l'écart: bisection sur les seuils au lieu d'une
+            # chaîne if/elif par match
+            icon = _DIFF_ICONS[bisect_left(_DIFF_THRESHOLDS, match.elo_difference)]
+
+            # Échapper les champs dynamiques (noms, tournois) pour le HTML Telegram
+            parts.append(
+                f"{icon} <b>Match {i}</b> ({html.escape(match.tour)})\n"
+                f"🏆 {html.escape(higher_elo_player)} ({higher_elo:.0f})\n"
+                f"🆚 {html.escape(lower_elo_player)} ({lower_elo:.0f})\n"
+                f"🎯 Surface: {match.surface.title()}\n"
+                f"📈 Écart ELO: <b>{match.elo_difference:.0f}</b>\n"
+                f"🏟️ {html.escape(match.tournament)}\n\n"
+            )
+
         if len(matches) > 20:
-            message += f"... et {len(matches) - 20} autres matchs\n\n"
-        
-        message += f"🤖 Analyse basée sur {len(self.atp_elo)} joueurs ATP et {len(self.wta_elo)} joueuses WTA"
-        
-        return message
+            parts.append(f"... et {len(matches) - 20} autres matchs\n\n")
+
+        parts.append(f"🤖 Analyse basée sur {len(self.atp_index)} joueurs ATP et {len(self.wta_index)} joueuses WTA")
+
+        return ''.join(parts)
     
-    def send_telegram_message(self, message: str):
-        """Envoie le message sur Telegram"""
+    @staticmethod
+    def split_message_chunks(message: str, max_length: int = 4000) -> List[str]:
+        """Découpe un message en morceaux <= max_length caractères.
+
+        La découpe se fait sur les frontières de sections (lignes vides),
+        pour ne jamais couper un match en deux; la marge sous la limite
+        Telegram de 4096 absorbe le préfixe [i/n].
+        """
+        if len(message) <= max_length:
+            return [message]
+
+        chunks = []
+        current = ""
+
+        for section in message.split('\n\n'):
+            candidate = f"{current}\n\n{section}" if current else section
+            if len(candidate) > max_length and current:
+                chunks.append(current)
+                current = section
+            else:
+                current = candidate
+
+        if current:
+            chunks.append(current)
+
+        return chunks
+
+    async def send_telegram_message(self, message: str):
+        """Envoie le message sur Telegram (parties envoyées en parallèle)"""
         if TELEGRAM_BOT_TOKEN == 'VOTRE_BOT_TOKEN':
             logger.warning("Token Telegram non configuré - affichage du message:")
             print("\n" + "="*50)
@@ -489,58 +842,43 @@ class TennisEloBot:
         
         try:
             url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-            
-            # Diviser le message si trop long (limite Telegram: 4096 caractères)
-            max_length = 4000  # Marge de sécurité
-            
-            if len(message) > max_length:
-                # Diviser le message en parties
-                parts = []
-                current_part = ""
-                
-                for line in message.split('\n'):
-                    if len(current_part) + len(line) + 1 > max_length:
-                        if current_part:
-                            parts.append(current_part)
-                        current_part = line
-                    else:
-                        current_part += ('\n' if current_part else '') + line
-                
-                if current_part:
-                    parts.append(current_part)
-                
+
+            parts = self.split_message_chunks(message)
+
+            if len(parts) > 1:
                 logger.info(f"Message divisé en {len(parts)} parties")
-                
-                for i, part in enumerate(parts, 1):
-                    payload = {
-                        'chat_id': TELEGRAM_CHAT_ID,
-                        'text': f"[{i}/{len(parts)}]\n{part}" if len(parts) > 1 else part,
-                        'parse_mode': 'Markdown'
-                    }
-                    
-                    response = requests.post(url, json=payload)
-                    
-                    if response.status_code == 200:
-                        logger.info(f"Partie {i}/{len(parts)} envoyée avec succès")
-                    else:
-                        logger.error(f"Erreur envoi partie {i}: {response.text}")
-                    
-                    if i < len(parts):  # Pause entre les messages sauf pour le dernier
-                        time.sleep(2)
-            else:
+
+            # Limite Telegram réelle: ~1 message/seconde PAR chat (la limite
+            # de 30 msg/s est globale au bot). Sérialiser les envois avec une
+            # cadence d'environ 1 s, au lieu du time.sleep(2) historique
+            semaphore = asyncio.Semaphore(1)
+
+            async def send_part(client: 'httpx.AsyncClient', i: int, part: str):
                 payload = {
                     'chat_id': TELEGRAM_CHAT_ID,
-                    'text': message,
-                    'parse_mode': 'Markdown'
+                    'text': f"[{i}/{len(parts)}]\n{part}" if len(parts) > 1 else part,
+                    'parse_mode': 'HTML'
                 }
-                
-                response = requests.post(url, json=payload)
-                
-                if response.status_code == 200:
-                    logger.info("Message envoyé avec succès sur Telegram")
+                async with semaphore:
+                    response = await client.post(url, json=payload, timeout=10)
+                    if i < len(parts):
+                        await asyncio.sleep(1.05)
+                    return response
+
+            async with httpx.AsyncClient() as client:
+                responses = await asyncio.gather(
+                    *(send_part(client, i, part) for i, part in enumerate(parts, 1)),
+                    return_exceptions=True
+                )
+
+            for i, response in enumerate(responses, 1):
+                if isinstance(response, Exception):
+                    logger.error(f"Erreur envoi partie {i}: {response}")
+                elif response.status_code == 200:
+                    logger.info(f"Partie {i}/{len(parts)} envoyée avec succès")
                 else:
-                    logger.error(f"Erreur envoi Telegram: {response.status_code} - {response.text}")
-                    
+                    logger.error(f"Erreur envoi partie {i}: {response.status_code} - {response.text}")
+
         except Exception as e:
             logger.error(f"Erreur lors de l'envoi du message Telegram: {e}")
             import traceback
@@ -548,9 +886,16 @@ class TennisEloBot:
     
     def run_daily_analysis(self):
         """Lance l'analyse quotidienne"""
+        asyncio.run(self.run_daily_analysis_async())
+
+    async def run_daily_analysis_async(self):
+        """Lance l'analyse quotidienne (récupération des APIs en parallèle)"""
         logger.info("="*50)
         logger.info("DÉBUT DE L'ANALYSE QUOTIDIENNE")
         logger.info("="*50)
+
+        # Figer les bornes temporelles pour tout le run
+        self._refresh_time_bounds()
         
         # Vérifier que les clés API sont configurées
         api_configured = False
@@ -568,58 +913,55 @@ class TennisEloBot:
         
         if not api_configured:
             logger.error("Aucune API configurée - impossible de récupérer les matchs")
-            message = "⚠️ **ERREUR CONFIGURATION**\n\n"
+            message = "⚠️ <b>ERREUR CONFIGURATION</b>\n\n"
             message += "Aucune clé API n'est configurée. Veuillez configurer au moins une des clés suivantes dans les secrets GitHub:\n"
             message += "- ODDS_API_KEY\n"
             message += "- TENNIS_API_KEY\n\n"
             message += "Sans ces clés, le bot ne peut pas récupérer les matchs du jour."
-            self.send_telegram_message(message)
+            await self.send_telegram_message(message)
             return
         
-        # Récupération des matchs depuis les APIs disponibles
-        all_matches = []
-        
-        # API Odds
-        if ODDS_API_KEY != 'VOTRE_ODDS_API_KEY':
-            odds_matches = self.get_matches_from_odds_api()
-            all_matches.extend(odds_matches)
-        
-        # Tennis API
-        if TENNIS_API_KEY != 'VOTRE_TENNIS_API_KEY':
-            tennis_matches = self.get_matches_from_tennis_api()
-            all_matches.extend(tennis_matches)
-        
-        logger.info(f"Total matchs récupérés: {len(all_matches)}")
-        
-        # Suppression des doublons basée sur les joueurs et le tour
-        unique_matches = []
-        seen = set()
-        
-        for match in all_matches:
-            # Créer une clé unique pour détecter les doublons
-            key1 = (
-                self.normalize_player_name(match.get('player1', '')),
-                self.normalize_player_name(match.get('player2', '')),
-                match.get('tour', 'Unknown')
-            )
-            key2 = (
-                self.normalize_player_name(match.get('player2', '')),
-                self.normalize_player_name(match.get('player1', '')),
-                match.get('tour', 'Unknown')
-            )
-            
-            if key1 not in seen and key2 not in seen:
-                unique_matches.append(match)
-                seen.add(key1)
-                seen.add(key2)
-        
+        # Récupération des matchs depuis les APIs disponibles, en parallèle,
+        # avec dédoublonnage au fil de l'eau: pas de liste intermédiaire
+        # concaténée, chaque match est inséré (ou ignoré) dès son arrivée.
+        # La clé est canonique (forme LNRM) et indépendante de l'ordre des
+        # joueurs: "Sinner vs Alcaraz" et "alcaraz vs sinner" se recoupent.
+        unique: Dict[Tuple, Dict] = {}
+        total_fetched = 0
+
+        async with httpx.AsyncClient() as client:
+            tasks = []
+
+            # API Odds
+            if ODDS_API_KEY != 'VOTRE_ODDS_API_KEY':
+                tasks.append(self.get_matches_from_odds_api(client))
+
+            # Tennis API
+            if TENNIS_API_KEY != 'VOTRE_TENNIS_API_KEY':
+                tasks.append(self.get_matches_from_tennis_api(client))
+
+            for task in asyncio.as_completed(tasks):
+                for match in await task:
+                    total_fetched += 1
+                    key = (
+                        match.get('tour', TOUR_UNKNOWN),
+                        frozenset((
+                            lnrm(match.get('player1', '')),
+                            lnrm(match.get('player2', ''))
+                        ))
+                    )
+                    unique.setdefault(key, match)
+
+        unique_matches = list(unique.values())
+
+        logger.info(f"Total matchs récupérés: {total_fetched}")
         logger.info(f"Matchs uniques après suppression des doublons: {len(unique_matches)}")
         
         if not unique_matches:
             logger.info("Aucun match trouvé pour aujourd'hui")
-            message = f"🎾 Aucun match de tennis trouvé pour aujourd'hui ({date.today().strftime('%d/%m/%Y')})\n\n"
+            message = f"🎾 Aucun match de tennis trouvé pour aujourd'hui ({self._today.strftime('%d/%m/%Y')})\n\n"
             message += "Vérifiez les APIs ou attendez les prochains matchs ! 🕐"
-            self.send_telegram_message(message)
+            await self.send_telegram_message(message)
             return
         
         # Calcul des différences d'ELO
@@ -628,9 +970,9 @@ class TennisEloBot:
         
         if not analyzed_matches:
             logger.warning("Aucun match analysé avec succès")
-            message = f"⚠️ Erreur lors de l'analyse des matchs du {date.today().strftime('%d/%m/%Y')}\n\n"
+            message = f"⚠️ Erreur lors de l'analyse des matchs du {self._today.strftime('%d/%m/%Y')}\n\n"
             message += "Les données ELO n'ont pas pu être récupérées correctement."
-            self.send_telegram_message(message)
+            await self.send_telegram_message(message)
             return
         
         # Formatage et envoi du message
@@ -638,7 +980,7 @@ class TennisEloBot:
         telegram_message = self.format_telegram_message(analyzed_matches)
         
         logger.info("Envoi du message sur Telegram...")
-        self.send_telegram_message(telegram_message)
+        await self.send_telegram_message(telegram_message)
         
         logger.info("="*50)
         logger.info("ANALYSE QUOTIDIENNE TERMINÉE")
@@ -666,19 +1008,19 @@ def main():
         # Tentative d'envoi d'un message d'erreur si possible
         try:
             if TELEGRAM_BOT_TOKEN != 'VOTRE_BOT_TOKEN':
-                error_message = f"🚨 **ERREUR TENNIS BOT** 🚨\n\n"
+                error_message = f"🚨 <b>ERREUR TENNIS BOT</b> 🚨\n\n"
                 error_message += f"Le script a rencontré une erreur fatale:\n"
-                error_message += f"`{str(e)}`\n\n"
+                error_message += f"<code>{html.escape(str(e))}</code>\n\n"
                 error_message += f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-                
+
                 url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
                 payload = {
                     'chat_id': TELEGRAM_CHAT_ID,
                     'text': error_message,
-                    'parse_mode': 'Markdown'
+                    'parse_mode': 'HTML'
                 }
                 
-                requests.post(url, json=payload)
+                SESSION.post(url, json=payload)
         except:
             pass  # Ignore les erreurs lors de l'envoi du message d'erreur
         